@@ -0,0 +1,49 @@
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import InsecureRequestWarning
+from urllib3.util.retry import Retry
+from config.getconfig import getConfig
+
+
+# Suppress only the single warning from urllib3 needed.
+requests.packages.urllib3.disable_warnings(category=InsecureRequestWarning)
+
+#
+# Shared HTTP session for all Confluence calls
+#
+# Reusing one Session keeps TCP/TLS connections alive between requests instead
+# of paying a new handshake per call. The pool is sized for the parallel
+# publishing and cleanup thread pools; with pool_block a burst beyond that
+# waits for a kept-alive socket instead of opening a throwaway connection.
+#
+SESSION = requests.Session()
+# Certificate verification is off for every request (requests applies
+# session.verify to the connection pool per request)
+SESSION.verify = False
+SESSION.headers.update({
+    "Connection": "keep-alive",
+    "Accept": "application/json",
+    "User-Agent": "gh2confluence"
+})
+
+# Max connections kept open to Confluence (>= the largest worker pool,
+# including a raised "publish_workers" setting)
+POOL_MAXSIZE = max(32, int(getConfig().get("publish_workers") or 0))
+
+_adapter = HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=POOL_MAXSIZE,
+    pool_block=True,
+    # Backoff on rate limits (honouring Retry-After) and transient server errors.
+    # POST is left out: creating a page is not idempotent, and a streamed
+    # attachment body cannot be rewound for a resend.
+    max_retries=Retry(
+        total=5,
+        backoff_factor=0.5,
+        status_forcelist=[429, 500, 502, 503, 504],
+        allowed_methods=frozenset({"GET", "PUT", "DELETE"}),
+        respect_retry_after_header=True
+    )
+)
+SESSION.mount("https://", _adapter)
+SESSION.mount("http://", _adapter)
@@ -3,7 +3,8 @@ import logging
 import sys
 
 from config.getconfig import getConfig
-from pagesController import cleanupOrphanPages
+from httpSession import SESSION
+from pagesController import cleanupOrphanPages, prefetchExistingPages
 from pagesPublisher import publishFolder, buildExpectedPagesSet, _stats
 
 logging.basicConfig(level=logging.INFO)
@@ -25,7 +26,12 @@ logging.debug(CONFIG)
 logging.info("=" * 80)
 logging.info("PHASE 1: Building expected pages inventory")
 logging.info("=" * 80)
-expected_pages = buildExpectedPagesSet(folder=str(CONFIG["github_folder_with_md_files"]))
+manifest, expected_pages = buildExpectedPagesSet(folder=str(CONFIG["github_folder_with_md_files"]))
+prefetchExistingPages(
+    expected_titles=expected_pages,
+    login=inputArguments['login'],
+    password=inputArguments['password']
+)
 
 # Step 2: Publish all pages (UPDATE-or-CREATE)
 logging.info("\n" + "=" * 80)
@@ -33,7 +39,8 @@ logging.info("PHASE 2: Publishing documentation (UPDATE-or-CREATE)")
 logging.info("=" * 80)
 publishFolder(folder = str(CONFIG["github_folder_with_md_files"]),
   login=inputArguments['login'],
-  password=inputArguments['password'])
+  password=inputArguments['password'],
+  manifest=manifest)
 
 # Step 3: Cleanup orphan pages (only if publish was successful)
 logging.info("\n" + "=" * 80)
@@ -55,6 +62,9 @@ else:
     logging.warning("⚠️  Skipping cleanup due to publishing errors")
     logging.warning("   Fix errors and re-run to clean up orphans")
 
+# All Confluence calls are done - close the pooled keep-alive connections
+SESSION.close()
+
 # Print summary report
 print("\n" + "="*80)
 print("CONFLUENCE PUBLISHING SUMMARY")
@@ -62,6 +72,7 @@ print("="*80)
 print(f"\n✅ SUCCESSFUL: {_stats.success_count} pages published")
 print(f"   📝 Created: {_stats.created_count} new pages")
 print(f"   🔄 Updated: {_stats.updated_count} existing pages")
+print(f"   ⏸️ Unchanged: {_stats.unchanged_count} pages skipped")
 print(f"❌ FAILED: {len(_stats.errors)} pages")
 
 # Calculate success rate
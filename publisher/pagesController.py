@@ -1,17 +1,423 @@
-import json
+import gzip
+import hashlib
 import logging
-import requests
-from urllib.parse import quote
-from urllib3.exceptions import InsecureRequestWarning
+import os
+import random
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from requests import RequestException
 from requests.auth import HTTPBasicAuth
 from config.getconfig import getConfig
+from httpSession import SESSION, POOL_MAXSIZE
+
+logger = logging.getLogger(__name__)
+
+# orjson parses/serializes several times faster than stdlib json; fall back
+# to json where it is not installed. Request bodies are sent as _encode()d
+# bytes instead of requests' json= (which always uses stdlib json).
+try:
+    import orjson
+
+    def _loads(data):
+        return orjson.loads(data)
+
+    def _dumps(obj, pretty=False):
+        option = orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS if pretty else 0
+        return orjson.dumps(obj, option=option).decode('utf-8')
+
+    def _encode(obj):
+        return orjson.dumps(obj)
+except ImportError:
+    import json
+
+    def _loads(data):
+        return json.loads(data)
+
+    def _dumps(obj, pretty=False):
+        if pretty:
+            return json.dumps(obj, indent=4, sort_keys=True)
+        return json.dumps(obj)
+
+    def _encode(obj):
+        return json.dumps(obj).encode('utf-8')
+
+# requests-toolbelt streams multipart uploads from the open file; without it
+# requests builds the whole multipart body in memory first
+try:
+    from requests_toolbelt.multipart.encoder import MultipartEncoder
+except ImportError:
+    MultipartEncoder = None
+
 
 CONFIG = getConfig()
 
+# Config values resolved once at import
+_URL = CONFIG["confluence_url"]
+_CONTENT_URL = _URL + "content/"
+_SPACE = CONFIG["confluence_space"]
+_SEARCH_PATTERN = str(CONFIG["confluence_search_pattern"])
+# Suffix appended to every autogenerated page title
+_TITLE_SUFFIX = "  " + _SEARCH_PATTERN
+# Support both typo and correct spelling for backwards compatibility
+_DEFAULT_PARENT_ID = str(CONFIG.get("confluence_parent_page_id") or CONFIG.get("counfluence_parent_page_id"))
+
+# Max number of DELETE requests in flight during cleanup; cleanup runs after
+# publishing, so it may use every pooled connection
+DELETE_WORKERS = POOL_MAXSIZE
+# Max number of pages published in parallel by createPages()
+CREATE_WORKERS = 16
+
+# Search results page size (Confluence caps search at 250 per request)
+SEARCH_PAGE_LIMIT = 250
+# Max number of search result pages fetched in parallel
+SEARCH_WORKERS = 8
+
+# Max number of titles OR-ed together in one prefetch CQL query (CQL length limit)
+PREFETCH_CHUNK_SIZE = 50
+
+# Seconds to wait for a connection to Confluence on writes and deletes; the
+# read timeouts stay longer, but an unreachable host fails fast
+CONNECT_TIMEOUT = 10
+
+# Seconds to wait on an attachment upload response (bodies can be large)
+ATTACH_TIMEOUT = 120
+
+# Max number of (title, ancestor) search results memoized within a run
+PAGE_LOOKUP_CACHE_SIZE = 1024
+
+# Seconds a findPageByTitleDirect() hit is reused for the same title
+DIRECT_LOOKUP_TTL = 30
+
+# Title search retries: full-jitter backoff, delay drawn from
+# [0, min(cap, base * 2**attempt)] so concurrent workers don't retry in step
+SEARCH_RETRY_BASE_DELAY = 1.0
+SEARCH_RETRY_MAX_DELAY = 10.0
+# Circuit breaker: after this many failed Confluence calls in a row (title
+# searches and page writes, each already retried), fail lookups and writes
+# fast for BREAKER_COOLDOWN seconds instead of piling requests on a sick server
+BREAKER_THRESHOLD = 5
+BREAKER_COOLDOWN = 30
+
+# Confluence error messages of a create rejected because the title is taken
+_TITLE_EXISTS_RE = re.compile(r'already exists|same title', re.IGNORECASE)
+
+# Result of a page write refused while the circuit breaker is open
+_CIRCUIT_OPEN_RESULT = {
+    'success': False,
+    'error': 'Confluence circuit open after repeated failures',
+    'status_code': 'circuit_open'
+}
+
+# Space reference of every new page (the key of Confluence space for content
+# publishing); shared read-only by all create payloads
+_SPACE_REF = {"key": _SPACE}
+
+# Content type of the pre-encoded JSON request bodies (merged with SESSION headers)
+_JSON_HEADERS = {"Content-Type": "application/json"}
+_GZIP_JSON_HEADERS = {**_JSON_HEADERS, "Content-Encoding": "gzip"}
+
+# Gzip page write bodies (large storage-format HTML) when the optional
+# "gzip_request_bodies" config key is set; off by default because not every
+# Confluence deployment accepts compressed requests
+GZIP_REQUEST_BODIES = bool(CONFIG.get("gzip_request_bodies"))
+# Still on for this run (cleared after Confluence answers 415)
+_gzip_bodies = GZIP_REQUEST_BODIES
+
+# Autogeneration warning banner prepended to every page
+_BANNER = ('<p style="background-color:#e7be17;">⚠️ This page is auto-generated from OHFY-Core-AI repository. '
+           'Do not edit manually - changes will be overwritten. '
+           '<b><a href="https://github.com/ohanafy/OHFY-Core-AI">View source on GitHub</a></b></p>')
+
+# CQL clauses that never change within a run; only titles vary
+_CQL_SPACE_CLAUSE = f' AND space="{_SPACE}"'
+_CQL_ROOT_CLAUSE = f' AND ancestor={_DEFAULT_PARENT_ID}' + _CQL_SPACE_CLAUSE
+# Single-title lookup; only the (quoted) title and the ancestor are filled in
+_CQL_TITLE_TMPL = 'title="%s" AND ancestor=%s' + _CQL_SPACE_CLAUSE
+# Query parameters of the searchPages() walk over all autogenerated pages.
+# Only what the catalog stores is expanded (lastModified is a top-level
+# field of every search result), keeping the 250-result pages small
+_SEARCH_PARAMS = {
+    'cql': f'title~{{"{_SEARCH_PATTERN}"}} AND type=page AND space="{_SPACE}"',
+    'limit': SEARCH_PAGE_LIMIT,
+    'expand': 'content.version,content.ancestors',
+    'excerpt': 'none'  # no highlighted text snippet per result
+}
+
+# Existing pages found by prefetchExistingPages(): {full title: {'id', 'version', 'title'}}
+_existing_page_cache = {}
+# Full titles covered by a successful prefetch (found or not)
+_prefetched_titles = set()
+
+# findPageByTitleDirect() hits: {full title: (page, monotonic fetch time)}
+_direct_lookup_cache = {}
+
+# Circuit breaker state (see BREAKER_THRESHOLD)
+_breaker_lock = threading.Lock()
+_consecutive_failures = 0
+_breaker_open_until = 0.0
+
+# Local catalog of autogenerated pages persisted by searchPages() between runs
+PAGE_CATALOG_FILE = ".publisher_cache.json"
+# Seconds after which a saved catalog is ignored; every cleanup rewrites it,
+# so only a catalog left over from runs that never got to cleanup expires
+PAGE_CATALOG_MAX_AGE = 7 * 24 * 3600
+# Version and content hash of every page this publisher wrote, for the next run
+PUBLISHED_HASHES_FILE = ".publisher_hashes.json"
+
+
+#
+# Functions to load and save the state files kept between runs
+#
+def loadJsonState(path, key, max_age=None):
+    """
+    Load the entries of a state file written by saveJsonState().
+
+    Returns an empty dict if there is no file, it is unreadable, it is older
+    than max_age seconds, or it was written under another key.
+    """
+    try:
+        if max_age is not None and time.time() - os.path.getmtime(path) > max_age:
+            logger.info("%s is older than %ss - ignoring it", path, max_age)
+            return {}
+        with open(path, 'rb') as stateFile:
+            state = _loads(stateFile.read())
+    except (OSError, ValueError):
+        return {}
+
+    if state.get('key') != key:
+        return {}
+    return state.get('pages', {})
 
 
-# Suppress only the single warning from urllib3 needed.
-requests.packages.urllib3.disable_warnings(category=InsecureRequestWarning)
+def saveJsonState(path, key, pages):
+    """
+    Persist a state file atomically (write to temp file, then rename).
+    """
+    tmp_file = path + ".tmp"
+    try:
+        with open(tmp_file, 'w', encoding="utf-8") as stateFile:
+            stateFile.write(_dumps({'key': key, 'pages': pages}))
+        os.replace(tmp_file, path)
+        logger.debug("Saved %s entries to %s", len(pages), path)
+    except OSError as e:
+        logger.warning("Could not save %s: %s", path, e)
+
+
+#
+# Functions to load and save the local page catalog
+#
+def _pageCatalogKey():
+    return f'{_SPACE}|{_SEARCH_PATTERN}'
+
+
+def loadPageCatalog():
+    """
+    Load the page catalog written by the previous run.
+
+    Returns {full title: {'id', 'title', 'version', 'lastModified'}}, or an empty
+    dict if there is no catalog, it is older than PAGE_CATALOG_MAX_AGE, or it
+    belongs to another space/search pattern.
+    """
+    return loadJsonState(PAGE_CATALOG_FILE, _pageCatalogKey(), max_age=PAGE_CATALOG_MAX_AGE)
+
+
+def savePageCatalog(pages):
+    """
+    Persist the page catalog atomically (write to temp file, then rename).
+    """
+    saveJsonState(PAGE_CATALOG_FILE, _pageCatalogKey(), pages)
+
+
+def _indexPageCatalog(catalog):
+    """
+    Build the (parent page ID, full title) -> page lookup index from a catalog.
+    """
+    return {
+        (entry['parentId'], entry['title']): entry
+        for entry in catalog.values()
+        if entry.get('parentId')
+    }
+
+
+#
+# Functions to load and save what this publisher last wrote to each page
+#
+def loadPublishedHashes():
+    """
+    Load the published-content record written by the previous run.
+
+    Returns {page ID: [version, content hash]} for the pages this publisher
+    wrote, or an empty dict if there is no record for this space/pattern.
+    """
+    return loadJsonState(PUBLISHED_HASHES_FILE, _pageCatalogKey())
+
+
+def savePublishedHashes():
+    """
+    Persist the published-content record atomically (temp file, then rename).
+    """
+    saveJsonState(PUBLISHED_HASHES_FILE, _pageCatalogKey(), _published_hashes)
+
+
+def _publishedUnchanged(page, content_hash):
+    """
+    True if the live page is still the version this publisher wrote, with the
+    same content - even when Confluence normalized the stored body.
+    """
+    return _published_hashes.get(page['id']) == [page['version'], content_hash]
+
+
+_page_catalog = loadPageCatalog()
+# Local lookup index used by findPageByTitle(): {(parent page ID, full title): page}
+_title_index = _indexPageCatalog(_page_catalog)
+# {page ID: [version, content hash]} of the pages written (or confirmed) by this publisher
+_published_hashes = loadPublishedHashes()
+
+
+#
+# Function to build the full page title (title + search pattern suffix)
+#
+def _fullTitle(title):
+    return title + _TITLE_SUFFIX
+
+
+#
+# Function to resolve the Confluence parent page ID (None is the configured root)
+#
+def _resolveParent(parentPageID):
+    return _DEFAULT_PARENT_ID if parentPageID is None else str(parentPageID)
+
+
+#
+# Function to escape a value for use inside a double-quoted CQL string
+#
+def _cqlQuote(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"')
+
+
+#
+# Functions for content hashing (skip no-op updates)
+#
+def _contentHash(content):
+    """
+    Return a short BLAKE2 digest of page storage content.
+    """
+    return hashlib.blake2b(content.encode('utf-8'), digest_size=16).hexdigest()
+
+
+def _storedBodyHash(page):
+    """
+    Hash of the storage body in a content API page dict, or None if not expanded.
+    """
+    body = page.get('body', {}).get('storage', {}).get('value')
+    return _contentHash(body) if body is not None else None
+
+
+#
+# Function for binding the Confluence credentials to the shared session
+#
+def _ensureAuth(login, password):
+    """
+    Set SESSION.auth the first time credentials are seen (or when they change),
+    so requests don't each carry a freshly built HTTPBasicAuth.
+    """
+    auth = SESSION.auth
+    if auth is None or (auth.username, auth.password) != (login, password):
+        SESSION.auth = HTTPBasicAuth(login, password)
+
+
+#
+# Function to look up one chunk of expected titles for the prefetch
+#
+def _prefetchChunk(chunk):
+    """
+    Query the pages of one chunk of full titles into _existing_page_cache;
+    the chunk is marked resolved only once every result page was read.
+    """
+    titles_cql = " OR ".join('title="%s"' % _cqlQuote(t) for t in chunk)
+    current_url = _URL + "search"
+    params = {
+        'cql': f'({titles_cql})' + _CQL_ROOT_CLAUSE,
+        'limit': PREFETCH_CHUNK_SIZE,
+        'expand': 'content.version,content.body.storage'
+    }
+
+    try:
+        while current_url:
+            response = SESSION.get(
+                url=current_url,
+                params=params,
+                timeout=30
+            )
+
+            if response.status_code != 200:
+                logger.warning(f"Prefetch failed with status {response.status_code}")
+                break
+
+            results = _loads(response.content)
+            for result in results.get('results', []):
+                content = result.get('content', result)
+                _existing_page_cache[content['title']] = {
+                    'id': content['id'],
+                    'version': content.get('version', {}).get('number', 1),
+                    'title': content['title'],
+                    'body_hash': _storedBodyHash(content),
+                    'cached': True
+                }
+
+            next_link = results.get('_links', {}).get('next')
+            if next_link:
+                base_link = results.get('_links', {}).get('base') or _URL.split('/rest/')[0]
+                current_url = base_link + next_link
+                params = None  # next link already carries the query
+            else:
+                # Whole chunk answered: titles missing from the cache do not exist
+                _prefetched_titles.update(chunk)
+                current_url = None
+
+    except Exception as e:
+        logger.warning(f"Prefetch error: {e}")
+
+
+#
+# Function to look up all expected pages in a few batched requests
+#
+def prefetchExistingPages(expected_titles, login, password):
+    """
+    Look up all expected pages up front with batched CQL queries.
+
+    Instead of one search per page during publishing, titles are OR-ed together
+    in chunks of PREFETCH_CHUNK_SIZE. Found pages land in _existing_page_cache,
+    which findPageByTitle() consults before hitting the API.
+
+    Args:
+        expected_titles: Iterable of page base titles (without search pattern suffix)
+        login: Confluence email
+        password: Confluence API token
+
+    Returns:
+        Page index {full title: {'id', 'version', 'title', 'body_hash'} or None}
+        for every title the prefetch answered; None means the page does not exist
+    """
+    _ensureAuth(login, password)
+    full_titles = sorted(_fullTitle(title) for title in expected_titles)
+
+    logger.info(f"Prefetching existing pages for {len(full_titles)} titles...")
+
+    chunks = [full_titles[i:i + PREFETCH_CHUNK_SIZE]
+              for i in range(0, len(full_titles), PREFETCH_CHUNK_SIZE)]
+    # Chunks are independent queries - run them in parallel
+    with ThreadPoolExecutor(max_workers=SEARCH_WORKERS) as executor:
+        list(executor.map(_prefetchChunk, chunks))
+
+    logger.info(f"Prefetch found {len(_existing_page_cache)} existing pages "
+                 f"({len(_prefetched_titles)}/{len(full_titles)} titles resolved)")
+
+    return {title: _existing_page_cache.get(title) for title in _prefetched_titles}
+
 
 #
 # Function to check if page exists by title and parent
@@ -23,39 +429,48 @@ def findPageByTitleDirect(full_title, login, password):
     This bypasses the search index entirely by using the content API with title filter.
     Much more reliable for eventual consistency issues.
 
+    Pages found within the last DIRECT_LOOKUP_TTL seconds are served from
+    memory; writes to a page drop its entry.
+
     Returns page dict with 'id' and 'version' if found, None otherwise.
     """
+    _ensureAuth(login, password)
+    cached = _direct_lookup_cache.get(full_title)
+    if cached and time.monotonic() - cached[1] < DIRECT_LOOKUP_TTL:
+        logger.debug("Direct lookup served from cache: %s", full_title)
+        return cached[0]
+
     try:
         # Use content API with title parameter - bypasses search index
         # This is the most reliable way to find a page by exact title
-        encoded_title = quote(full_title)
-        url = f'{CONFIG["confluence_url"]}content?title={encoded_title}&spaceKey={CONFIG["confluence_space"]}&expand=version'
+        logger.debug("Direct lookup: %s", full_title)
 
-        logging.debug(f"Direct lookup: {full_title}")
-
-        response = requests.get(
-            url=url,
-            auth=HTTPBasicAuth(login, password),
-            verify=False,
+        # requests URL-encodes the query parameters (special characters in titles)
+        response = SESSION.get(
+            url=_URL + "content",
+            params={'title': full_title, 'spaceKey': _SPACE, 'expand': 'version,body.storage'},
             timeout=15
         )
 
         if response.status_code == 200:
-            results = response.json()
+            results = _loads(response.content)
             if results.get('size', 0) > 0:
                 page = results['results'][0]
                 version_num = page.get('version', {}).get('number', 1)
-                logging.info(f"Direct lookup found page: {page['id']} (v{version_num})")
-                return {
+                logger.info(f"Direct lookup found page: {page['id']} (v{version_num})")
+                found_page = {
                     'id': page['id'],
                     'version': version_num,
-                    'title': page.get('title', '')
+                    'title': page.get('title', ''),
+                    'body_hash': _storedBodyHash(page)
                 }
+                _direct_lookup_cache[full_title] = (found_page, time.monotonic())
+                return found_page
 
         return None
 
     except Exception as e:
-        logging.warning(f"Direct lookup error: {e}")
+        logger.warning(f"Direct lookup error: {e}")
         return None
 
 
@@ -66,128 +481,235 @@ def findPageByTitle(title, parentPageID, login, password):
     Uses ancestor= instead of parent= to find pages at any depth in the hierarchy.
     Implements retry logic to handle Confluence search index eventual consistency.
 
+    Pages already known from the prefetch or the local catalog index are
+    returned without an API call; those results carry 'cached': True. Catalog
+    results were saved by an earlier run and may be out of date; they also
+    carry 'from_catalog': True.
+
     Returns page dict with 'id' and 'version' if found, None otherwise.
+    Raises RuntimeError if the search keeps failing, so the caller does not
+    mistake a failed lookup for a missing page.
     """
-    import time
-
-    # Support both typo and correct spelling for backwards compatibility
-    parent_id = CONFIG.get("confluence_parent_page_id") or CONFIG.get("counfluence_parent_page_id")
-    if parentPageID is None:
-        parent_id_to_use = parent_id
-    else:
-        parent_id_to_use = str(parentPageID)
+    _ensureAuth(login, password)
+    parent_id_to_use = _resolveParent(parentPageID)
 
     # Build search query - exact title match with ancestor constraint
     # CQL: title="exact title" AND ancestor={id} AND space="key"
     # NOTE: ancestor= finds pages at ANY depth, not just direct children
-    search_title = title + "  " + str(CONFIG["confluence_search_pattern"])
-    cql_query = f'title="{search_title}" AND ancestor={parent_id_to_use} AND space="{CONFIG["confluence_space"]}"'
+    search_title = _fullTitle(title)
+
+    # Serve from the prefetched pages when possible (no API call).
+    # Entries are popped so a second lookup of the same title goes to the API
+    # and never sees a stale version number.
+    cached_page = _existing_page_cache.pop(search_title, None)
+    if cached_page:
+        # The title is no longer answered by the prefetch either way
+        _prefetched_titles.discard(search_title)
+        logger.info(f"Found existing page in prefetch cache: {cached_page['id']} (v{cached_page['version']})")
+        return cached_page
+    if search_title in _prefetched_titles:
+        _prefetched_titles.discard(search_title)
+        logger.debug("Prefetch shows no existing page for: %s", search_title)
+        return None
+
+    # Then from the local catalog index built by searchPages()
+    indexed_page = _title_index.pop((parent_id_to_use, search_title), None)
+    if indexed_page:
+        logger.info(f"Found existing page in local index: {indexed_page['id']} (v{indexed_page['version']})")
+        return {
+            'id': indexed_page['id'],
+            'version': indexed_page['version'],
+            'title': indexed_page['title'],
+            'cached': True,
+            'from_catalog': True
+        }
+
+    if _breakerOpen():
+        raise RuntimeError("Confluence circuit open after repeated failures")
+
+    try:
+        page = _searchPageByTitle(search_title, parent_id_to_use, login, password)
+    except RuntimeError:
+        _recordFailure()
+        raise
+    _recordSuccess()
+    return page
+
+
+#
+# Functions for the Confluence circuit breaker
+#
+def _breakerOpen():
+    with _breaker_lock:
+        return time.monotonic() < _breaker_open_until
+
+
+def _recordFailure():
+    global _consecutive_failures, _breaker_open_until
+    with _breaker_lock:
+        _consecutive_failures += 1
+        if _consecutive_failures >= BREAKER_THRESHOLD:
+            _breaker_open_until = time.monotonic() + BREAKER_COOLDOWN
+            logger.warning(f"Confluence calls failed {_consecutive_failures} times in a row - "
+                           f"pausing lookups and writes for {BREAKER_COOLDOWN}s")
+
+
+def _recordSuccess():
+    global _consecutive_failures
+    with _breaker_lock:
+        _consecutive_failures = 0
 
-    # URL-encode the CQL query to handle special characters
-    encoded_cql = quote(cql_query)
 
-    logging.debug(f"Searching for existing page: {cql_query}")
+def _recordCallStatus(status_code):
+    """
+    Count a write response: server errors and rate limits (left after the
+    session's retries) are failures, anything else shows Confluence is up.
+    """
+    if status_code >= 500 or status_code == 429:
+        _recordFailure()
+    else:
+        _recordSuccess()
+
+
+@lru_cache(maxsize=PAGE_LOOKUP_CACHE_SIZE)
+def _searchPageByTitle(search_title, parent_id_to_use, login, password):
+    """
+    CQL search for one page title, memoized per (title, ancestor) for the run.
+
+    Only definite answers (found / not found) are cached; a failed search
+    raises RuntimeError so the next call tries again. createPage() keeps the
+    cached entries current after it writes (see clearPageCache()).
+    """
+    # requests URL-encodes the query parameters (special characters in titles)
+    search_params = {
+        'cql': _CQL_TITLE_TMPL % (_cqlQuote(search_title), parent_id_to_use),
+        'limit': 1,  # exact title match - only the first result is read
+        'expand': 'content.version,content.body.storage',
+        'excerpt': 'none'
+    }
+
+    logger.debug("Searching for existing page: %s (ancestor %s)", search_title, parent_id_to_use)
 
     # Retry logic to handle eventual consistency
     max_retries = 3
-    retry_delays = [0, 2, 4]  # 0s, 2s, 4s delays
+    last_error = None
 
     for attempt in range(max_retries):
         try:
             if attempt > 0:
-                delay = retry_delays[attempt]
-                logging.debug(f"Retry {attempt}/{max_retries-1} after {delay}s delay (eventual consistency)")
+                delay = random.uniform(0, min(SEARCH_RETRY_MAX_DELAY, SEARCH_RETRY_BASE_DELAY * 2 ** attempt))
+                logger.debug("Retry %s/%s after %.1fs delay (eventual consistency)", attempt, max_retries-1, delay)
                 time.sleep(delay)
 
-            response = requests.get(
-                url=f'{CONFIG["confluence_url"]}search?cql={encoded_cql}&limit=5&expand=version',
-                auth=HTTPBasicAuth(login, password),
-                verify=False,
+            response = SESSION.get(
+                url=_URL + "search",
+                params=search_params,
                 timeout=10
             )
 
             if response.status_code == 200:
-                results = json.loads(response.text)
+                results = _loads(response.content)
                 if results.get('size', 0) > 0:
-                    # Found existing page
-                    # Search API returns results[0] with 'content' and 'version' at same level
-                    result = results['results'][0]
-                    page_data = result.get('content', result)  # Fallback to result if no content key
-
-                    # Version might be at result level or content level
-                    version_data = result.get('version', page_data.get('version'))
-
-                    if version_data and 'number' in version_data:
-                        version_num = version_data['number']
-                    else:
-                        # Fallback: fetch full page details to get version
-                        logging.debug(f"Version not in search results, fetching page details for {page_data['id']}")
-                        page_resp = requests.get(
-                            url=f'{CONFIG["confluence_url"]}content/{page_data["id"]}',
-                            auth=HTTPBasicAuth(login, password),
-                            verify=False,
-                            timeout=10
-                        )
-                        if page_resp.status_code == 200:
-                            full_page = page_resp.json()
-                            version_num = full_page.get('version', {}).get('number', 1)
-                        else:
-                            version_num = 1  # Default if we can't get version
-
-                    logging.info(f"Found existing page: {page_data['id']} (v{version_num})")
+                    # Found existing page; search results nest the expanded
+                    # version under 'content', so no extra GET is needed
+                    page_data = results['results'][0]['content']
+                    version_num = page_data['version']['number']
+
+                    logger.info(f"Found existing page: {page_data['id']} (v{version_num})")
                     return {
                         'id': page_data['id'],
                         'version': version_num,
-                        'title': page_data.get('title', '')
+                        'title': page_data.get('title', ''),
+                        'body_hash': _storedBodyHash(page_data)
                     }
                 elif attempt < max_retries - 1:
                     # Not found yet, but we have retries left
-                    logging.debug(f"Page not found on attempt {attempt + 1}, will retry...")
+                    logger.debug("Page not found on attempt %s, will retry...", attempt + 1)
                     continue
                 else:
                     # Final attempt, page truly doesn't exist
-                    logging.debug("No existing page found after all retries")
+                    logger.debug("No existing page found after all retries")
                     return None
             else:
-                logging.warning(f"Search failed with status {response.status_code}")
-                if attempt < max_retries - 1:
-                    continue
-                return None
+                logger.warning(f"Search failed with status {response.status_code}")
+                last_error = f"search failed with status {response.status_code}"
 
-        except Exception as e:
-            logging.warning(f"Error searching for existing page (attempt {attempt + 1}): {e}")
-            if attempt < max_retries - 1:
-                continue
-            return None
+        except RequestException as e:
+            logger.warning(f"Error searching for existing page (attempt {attempt + 1}): {e}")
+            last_error = str(e)
 
-    return None
+    raise RuntimeError(last_error)
+
+
+def clearPageCache():
+    """
+    Forget every page lookup made so far (prefetch and memoized searches).
+
+    For long-running callers that publish several times in one process.
+    """
+    _searchPageByTitle.cache_clear()
+    _direct_lookup_cache.clear()
+    _existing_page_cache.clear()
+    _prefetched_titles.clear()
 
 
 #
 # Function for UPDATE-or-CREATE page with CONTENT (idempotent)
 #
-def createPage(title, content, parentPageID, login, password):
+def createPage(title, content, parentPageID, login, password, page_index=None):
     """
     Idempotent page publishing: Updates existing page or creates new one.
     This replaces the old CREATE-only logic to eliminate duplicate page errors.
+
+    page_index is an optional index as returned by prefetchExistingPages().
+    Titles present in it (found or not) skip the findPageByTitle() lookup.
     """
+    _ensureAuth(login, password)
 
     # Build page title with search pattern
-    full_title = title + "  " + str(CONFIG["confluence_search_pattern"])
+    full_title = _fullTitle(title)
 
     # Add autogeneration warning banner
-    banner = "<p style=\"background-color:#e7be17;\">⚠️ This page is auto-generated from OHFY-Core-AI repository. " + \
-             "Do not edit manually - changes will be overwritten. " + \
-             "<b><a href=\"https://github.com/ohanafy/OHFY-Core-AI\">View source on GitHub</a></b></p>"
-    full_content = banner + content
+    full_content = _BANNER + content
 
     # Check if page already exists
-    existing_page = findPageByTitle(title, parentPageID, login, password)
+    if page_index is not None and full_title in page_index:
+        existing_page = page_index[full_title]
+        # Consume the prefetch entry as findPageByTitle() would, so a retry
+        # after a stale version looks the page up live
+        _existing_page_cache.pop(full_title, None)
+        _prefetched_titles.discard(full_title)
+    else:
+        try:
+            existing_page = findPageByTitle(title, parentPageID, login, password)
+        except RuntimeError as e:
+            # Creating the page now could duplicate one the search missed
+            logger.error(f"Lookup failed, skipping page: {full_title}: {e}")
+            return {
+                'success': False,
+                'error': f'Page lookup failed: {e}',
+                'status_code': 'lookup_failed'
+            }
+
+    content_hash = _contentHash(full_content)
+
+    # Stored content is identical, or the live page (fetched in this run, not
+    # an old catalog entry) is still exactly what this publisher wrote last time
+    if existing_page and (existing_page.get('body_hash') == content_hash or
+                          (not existing_page.get('from_catalog') and _publishedUnchanged(existing_page, content_hash))):
+        # Skip the PUT and the version bump
+        logger.info(f"Page unchanged, skipping update: {full_title} (ID: {existing_page['id']})")
+        _published_hashes[existing_page['id']] = [existing_page['version'], content_hash]
+        return {
+            'success': True,
+            'page_id': existing_page['id'],
+            'operation': 'unchanged'
+        }
 
     if existing_page:
         # UPDATE existing page
-        logging.info(f"Updating existing page: {full_title} (ID: {existing_page['id']})")
-        return updatePage(
+        logger.info(f"Updating existing page: {full_title} (ID: {existing_page['id']})")
+        result = updatePage(
             page_id=existing_page['id'],
             title=full_title,
             content=full_content,
@@ -195,16 +717,95 @@ def createPage(title, content, parentPageID, login, password):
             login=login,
             password=password
         )
+        if result['success']:
+            # Keep a memoized search result current for repeated lookups
+            existing_page['version'] += 1
+            existing_page['body_hash'] = content_hash
+            _published_hashes[existing_page['id']] = [existing_page['version'], content_hash]
+            return result
+
+        # The memoized search result may be what went stale
+        _searchPageByTitle.cache_clear()
+        if not existing_page.get('cached') or result.get('status_code') not in (404, 409):
+            return result
+
+        # Cached page was deleted or its version is stale: the prefetch entry
+        # is already consumed (and page_index is not passed on), so this
+        # lookup goes to the API
+        logger.info(f"Cached page {existing_page['id']} is stale - looking it up again")
+        return createPage(title, content, parentPageID, login, password)
     else:
         # CREATE new page
-        logging.info(f"Creating new page: {full_title}")
-        return createNewPage(
+        logger.info(f"Creating new page: {full_title}")
+        result = createNewPage(
             title=full_title,
             content=full_content,
             parentPageID=parentPageID,
             login=login,
             password=password
         )
+        # A memoized "not found" for this title is no longer true
+        _searchPageByTitle.cache_clear()
+        if result.get('operation') == 'created':
+            _published_hashes[result['page_id']] = [1, content_hash]
+        return result
+
+
+#
+# Function for UPDATE-or-CREATE of many independent pages
+#
+def createPages(pages, login, password):
+    """
+    Publish many pages concurrently with createPage().
+
+    pages is an iterable of dicts with createPage()'s 'title', 'content' and
+    'parentPageID' keys. The pages must not depend on each other (parents have
+    to exist already). Lookups and writes of different pages overlap on the
+    shared session's connection pool.
+
+    Returns createPage() results in input order.
+    """
+    pages = list(pages)
+    if not pages:
+        return []
+
+    with ThreadPoolExecutor(max_workers=min(CREATE_WORKERS, len(pages))) as executor:
+        return list(executor.map(
+            lambda page: createPage(login=login, password=password, **page),
+            pages
+        ))
+
+
+#
+# Function for sending a page write (PUT/POST) with a JSON body
+#
+def _sendPageWrite(method, url, payload):
+    """
+    Send payload as JSON, gzip-compressed while GZIP_REQUEST_BODIES is on.
+
+    Not every Confluence deployment decompresses request bodies: on 415 the
+    body is sent again uncompressed, and compression stays off for the run.
+    """
+    global _gzip_bodies
+    body = _encode(payload)
+    if _gzip_bodies:
+        response = method(
+            url=url,
+            data=gzip.compress(body, compresslevel=6),  # zlib's default speed/size balance
+            headers=_GZIP_JSON_HEADERS,
+            timeout=(CONNECT_TIMEOUT, 30)
+        )
+        if response.status_code != 415:
+            return response
+        logger.warning("Confluence rejected a gzip request body - sending bodies uncompressed")
+        _gzip_bodies = False
+
+    return method(
+        url=url,
+        data=body,
+        headers=_JSON_HEADERS,
+        timeout=(CONNECT_TIMEOUT, 30)
+    )
 
 
 #
@@ -214,6 +815,9 @@ def updatePage(page_id, title, content, version, login, password):
     """
     Update existing Confluence page via PUT request.
     """
+    _ensureAuth(login, password)
+    if _breakerOpen():
+        return dict(_CIRCUIT_OPEN_RESULT)
     update_payload = {
         "id": page_id,
         "type": "page",
@@ -229,30 +833,30 @@ def updatePage(page_id, title, content, version, login, password):
         }
     }
 
-    logging.debug(f"Updating page {page_id} to version {version + 1}")
+    logger.debug("Updating page %s to version %s", page_id, version + 1)
 
     try:
-        response = requests.put(
-            url=f'{CONFIG["confluence_url"]}content/{page_id}',
-            json=update_payload,
-            auth=HTTPBasicAuth(login, password),
-            verify=False
-        )
+        response = _sendPageWrite(SESSION.put, _CONTENT_URL + str(page_id), update_payload)
 
-        logging.debug(f"Update response status: {response.status_code}")
+        logger.debug("Update response status: %s", response.status_code)
+        _recordCallStatus(response.status_code)
 
         if response.status_code == 200:
-            response_json = json.loads(response.text)
-            logging.info(f"Updated successfully (v{version + 1})")
+            logger.info(f"Updated successfully (v{version + 1})")
+            _direct_lookup_cache.pop(title, None)
             return {
                 'success': True,
                 'page_id': page_id,
                 'operation': 'updated'
             }
         else:
-            response_json = json.loads(response.text)
+            try:
+                response_json = _loads(response.content)
+            except ValueError:
+                # Gateways answer errors with HTML; keep the status code
+                response_json = {'message': f'Invalid JSON response from Confluence (status {response.status_code})'}
             error_message = response_json.get('message', 'Unknown error')
-            logging.error(f"Update failed: {error_message}")
+            logger.error(f"Update failed: {error_message}")
             return {
                 'success': False,
                 'error': error_message,
@@ -261,7 +865,9 @@ def updatePage(page_id, title, content, version, login, password):
             }
 
     except Exception as e:
-        logging.error(f"Exception during page update: {e}")
+        if isinstance(e, RequestException):
+            _recordFailure()
+        logger.error(f"Exception during page update: {e}")
         return {
             'success': False,
             'error': str(e),
@@ -279,74 +885,69 @@ def createNewPage(title, content, parentPageID, login, password):
     BULLETPROOF: If creation fails with "title already exists", uses direct
     Content API lookup (bypasses search index) to find and update the page.
     """
-    # descripe json query
-    newPageJSONQueryString = """
-    {
+    _ensureAuth(login, password)
+    if _breakerOpen():
+        return dict(_CIRCUIT_OPEN_RESULT)
+    # root of our pages tree, or the branch given by ParentPageID
+    parent_id = _resolveParent(parentPageID)
+
+    # describe json query (only title, parent and body vary per page)
+    newPagejsonQuery = {
         "type": "page",
-        "title": "DEFAULT PAGE TITLE",
+        "title": title,
         "ancestors": [
             {
-            "id": 111
+                "id": parent_id
             }
         ],
-        "space": {
-            "key": "DEFAULT KEY"
-        },
+        "space": _SPACE_REF,
         "body": {
             "storage": {
-                "value": "DEFAULT PAGE CONTENT",
+                "value": content,
                 "representation": "storage"
             }
         }
     }
-    """
-
-    # load json from string
-    newPagejsonQuery = json.loads(newPageJSONQueryString)
-
-    # the key of Confluence space for content publishing
-    newPagejsonQuery['space']['key'] = CONFIG["confluence_space"]
-
-    # check of input of the ParentPageID
-    if parentPageID is None:
-        # Support both typo and correct spelling for backwards compatibility
-        parent_id = CONFIG.get("confluence_parent_page_id") or CONFIG.get("counfluence_parent_page_id")
-        newPagejsonQuery['ancestors'][0]['id']  = parent_id # this is the root of out pages tree
-    else:
-        newPagejsonQuery['ancestors'][0]['id'] = str(parentPageID) # this is the branch of our tree
-
-    newPagejsonQuery['title'] = title
-    newPagejsonQuery['body']['storage']['value'] = content
 
-    logging.debug(f"Creating page: {title}")
-    logging.debug(json.dumps(newPagejsonQuery, indent=4, sort_keys=True))
+    logger.debug("Creating page: %s", title)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(_dumps(newPagejsonQuery, pretty=True))
 
     # make call to create new page
-    response = requests.post(
-        url=CONFIG["confluence_url"] + "content/",
-        json=newPagejsonQuery,
-        auth=HTTPBasicAuth(login, password),
-        verify=False)
+    try:
+        response = _sendPageWrite(SESSION.post, _CONTENT_URL, newPagejsonQuery)
+    except RequestException as e:
+        _recordFailure()
+        logger.error(f"Exception during page creation: {e}")
+        return {
+            'success': False,
+            'error': str(e),
+            'status_code': 'exception'
+        }
 
-    logging.debug(response.status_code)
+    logger.debug(response.status_code)
+    _recordCallStatus(response.status_code)
 
     # Parse response
     try:
-        response_json = json.loads(response.text)
-        logging.debug(json.dumps(response_json, indent=4, sort_keys=True))
-    except json.JSONDecodeError:
-        logging.error("Failed to parse response JSON")
+        response_json = _loads(response.content)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(_dumps(response_json, pretty=True))
+    except ValueError:
+        logger.error("Failed to parse response JSON")
         return {
             'success': False,
             'error': f'Invalid JSON response from Confluence (status {response.status_code})',
-            'response_text': response.text[:500]  # First 500 chars for debugging
+            # First 500 bytes for debugging, without decoding the whole body
+            'response_text': response.content[:500].decode('utf-8', 'replace')
         }
 
     # Check if page was created successfully
     if response.status_code == 200 and 'id' in response_json:
-        logging.info("Created successfully")
+        logger.info("Created successfully")
+        _direct_lookup_cache.pop(title, None)
         page_id = response_json['id']
-        logging.debug("Returning created page id: " + page_id)
+        logger.debug("Returning created page id: %s", page_id)
         return {
             'success': True,
             'page_id': page_id,
@@ -357,43 +958,28 @@ def createNewPage(title, content, parentPageID, login, password):
         error_message = response_json.get('message', 'Unknown error')
 
         # BULLETPROOF FIX: Handle "title already exists" by using direct lookup
-        if 'already exists' in error_message.lower() or 'same title' in error_message.lower():
-            logging.warning(f"Title exists but search didn't find it - using direct Content API lookup")
+        if _TITLE_EXISTS_RE.search(error_message):
+            logger.warning(f"Title exists but search didn't find it - using direct Content API lookup")
 
             # Use direct Content API lookup (bypasses search index entirely)
             existing_page = findPageByTitleDirect(title, login, password)
 
             if existing_page:
-                logging.info(f"Direct lookup found page {existing_page['id']} - updating instead")
-                return updatePage(
-                    page_id=existing_page['id'],
-                    title=title,
-                    content=content,
-                    version=existing_page['version'],
-                    login=login,
-                    password=password
-                )
+                logger.info(f"Direct lookup found page {existing_page['id']} - updating instead")
+                return _updateFoundPage(existing_page, title, content, login, password)
             else:
                 # Last resort: wait and retry direct lookup
-                import time
-                logging.warning("Direct lookup failed, waiting 3s and retrying...")
+                logger.warning("Direct lookup failed, waiting 3s and retrying...")
                 time.sleep(3)
 
                 existing_page = findPageByTitleDirect(title, login, password)
                 if existing_page:
-                    logging.info(f"Retry found page {existing_page['id']} - updating")
-                    return updatePage(
-                        page_id=existing_page['id'],
-                        title=title,
-                        content=content,
-                        version=existing_page['version'],
-                        login=login,
-                        password=password
-                    )
-
-                logging.error(f"Could not find page even with direct lookup: {title}")
-
-        logging.error(f"Page creation failed: {error_message}")
+                    logger.info(f"Retry found page {existing_page['id']} - updating")
+                    return _updateFoundPage(existing_page, title, content, login, password)
+
+                logger.error(f"Could not find page even with direct lookup: {title}")
+
+        logger.error(f"Page creation failed: {error_message}")
         return {
             'success': False,
             'error': error_message,
@@ -403,83 +989,209 @@ def createNewPage(title, content, parentPageID, login, password):
 
 
 #
-# Function for searching pages with SEARCH TEST in the title
+# Function to UPDATE a page found by the direct lookup after a failed create
 #
-def searchPages(login, password):
+def _updateFoundPage(existing_page, title, content, login, password):
     """
-    Search for all autogenerated pages with pagination support.
+    Update the page, unless its stored body already is this content (e.g. an
+    earlier run created it but the search index had not caught up yet).
+    """
+    if existing_page.get('body_hash') == _contentHash(content):
+        logger.info(f"Page unchanged, skipping update: {title} (ID: {existing_page['id']})")
+        return {
+            'success': True,
+            'page_id': existing_page['id'],
+            'operation': 'unchanged'
+        }
 
-    Confluence API caps results at 250 per request, so we use pagination
-    to fetch all pages across multiple requests.
+    return updatePage(
+        page_id=existing_page['id'],
+        title=title,
+        content=content,
+        version=existing_page['version'],
+        login=login,
+        password=password
+    )
+
+
+#
+# Function for fetching one batch of search results
+#
+def _fetchSearchBatch(url, login, password, params=None, expected_start=None):
     """
-    # Support both typo and correct spelling for backwards compatibility
-    parent_id = CONFIG.get("confluence_parent_page_id") or CONFIG.get("counfluence_parent_page_id")
+    GET one page of search results. Returns the parsed JSON, or None on failure.
 
-    # Initial CQL query URL with limit=250 (Confluence's max per-page limit)
-    base_cql = f'title~{{"{CONFIG["confluence_search_pattern"]}"}}+and+type=page+and+space="{CONFIG["confluence_space"]}"'
-    initial_url = f'{CONFIG["confluence_url"]}search?cql={base_cql}&limit=250'
+    With expected_start, a batch that does not begin at that offset (the
+    server ignored start= and paginates by cursor only) is a failure too.
+    """
+    logger.debug("Fetching search batch: %s %s", url, params)
+    try:
+        response = SESSION.get(
+            url=url,
+            params=params,
+            timeout=30
+        )
+    except RequestException as e:
+        logger.error(f"Search request failed: {e}")
+        return None
 
-    foundPages = []
-    current_url = initial_url
-    page_count = 0
+    if response.status_code != 200:
+        logger.error(f"Search failed with status {response.status_code}")
+        # Decode only the logged prefix, not a whole (possibly large) error body
+        logger.error(f"Response: {response.content[:500].decode('utf-8', 'replace')}")
+        return None
 
-    logging.info(f"Searching for pages with pattern: {CONFIG['confluence_search_pattern']}")
+    results = _loads(response.content)
+    if expected_start is not None and results.get('start') != expected_start:
+        logger.warning("Search returned offset %s instead of %s - start= is not supported",
+                       results.get('start'), expected_start)
+        return None
+    return results
 
-    # Paginate through all results
-    while current_url:
-        page_count += 1
-        logging.debug(f"Fetching page {page_count}: {current_url}")
 
-        try:
-            response = requests.get(
-                url=current_url,
-                auth=HTTPBasicAuth(login, password),
-                verify=False,
-                timeout=30
-            )
+def _nextSearchUrl(results):
+    """
+    Build the absolute URL of the next results page, or None on the last page.
+    """
+    next_link = results.get('_links', {}).get('next')
+    if not next_link:
+        return None
 
-            if response.status_code != 200:
-                logging.error(f"Search failed with status {response.status_code}")
-                logging.error(f"Response: {response.text[:500]}")
-                break
+    # Next link is relative path like "/rest/api/search?..."
+    # Construct full URL from base domain
+    base_link = results.get('_links', {}).get('base', '')
+    if base_link:
+        return base_link + next_link
+    # Fallback: extract domain from confluence_url
+    domain = _URL.split('/rest/')[0]
+    return domain + next_link
 
-            results = response.json()
 
-            # Extract page IDs from this batch
-            batch_size = len(results.get('results', []))
-            for result in results.get('results', []):
-                page_id = result['content']['id']
-                page_title = result['content']['title']
-                foundPages.append(page_id)
-                logging.debug(f"Found page: {page_id} - {page_title}")
+def _catalogSearchBatch(results, catalog, batch_number):
+    """
+    Add one batch of search results to catalog ({full title: entry}).
+    """
+    batch = results.get('results', ())
+    for result in batch:
+        content = result['content']
+        if content['title'] in catalog:
+            continue  # batches can overlap if pages changed between requests
+        ancestors = content.get('ancestors') or [{}]
+        catalog[content['title']] = {
+            'id': content['id'],
+            'title': content['title'],
+            'version': content.get('version', {}).get('number', 1),
+            'lastModified': result.get('lastModified'),
+            'parentId': ancestors[-1].get('id')
+        }
 
-            total_size = results.get('totalSize', 0)
-            current_count = len(foundPages)
-            logging.info(f"Batch {page_count}: Retrieved {batch_size} pages ({current_count}/{total_size} total)")
+    logger.info(f"Batch {batch_number}: Retrieved {len(batch)} pages ({len(catalog)}/{results.get('totalSize', 0)} total)")
 
-            # Check for next page
-            next_link = results.get('_links', {}).get('next')
-            if next_link:
-                # Next link is relative path like "/rest/api/search?..."
-                # Construct full URL from base domain
-                base_link = results.get('_links', {}).get('base', '')
-                if base_link:
-                    current_url = base_link + next_link
-                else:
-                    # Fallback: extract domain from confluence_url
-                    domain = CONFIG["confluence_url"].split('/rest/')[0]
-                    current_url = domain + next_link
-                logging.debug(f"More results available, following pagination to: {current_url}")
+
+#
+# Function for searching pages with SEARCH TEST in the title
+#
+def searchPages(login, password):
+    """
+    Search for all autogenerated pages with pagination support.
+
+    Confluence API caps results at 250 per request, so we use pagination
+    to fetch all pages across multiple requests. The first request reveals
+    totalSize; the remaining offsets are then fetched in parallel. If an
+    offset request fails, the server ignores start=, or the batches do not
+    add up to totalSize, the sequential _links.next walk is used instead,
+    with each next page requested before the current one is cataloged.
+
+    A complete result is also saved as the local page catalog
+    (id, title, version, lastModified, parentId) for the next run and
+    refreshes the title index used by findPageByTitle().
+
+    Returns a list of {'id', 'title'} dicts.
+    """
+    _ensureAuth(login, password)
+    # Initial CQL query with limit=250 (Confluence's max per-page limit)
+    search_url = _URL + "search"
+
+    foundPages = []
+    catalog = {}
+    complete = False
+
+    logger.info(f"Searching for pages with pattern: {_SEARCH_PATTERN}")
+
+    try:
+        first_batch = _fetchSearchBatch(search_url, login, password, params=_SEARCH_PARAMS)
+
+        if first_batch is not None:
+            batch_count = 1
+            _catalogSearchBatch(first_batch, catalog, batch_count)
+            batch_len = len(first_batch.get('results', []))
+            total_size = first_batch.get('totalSize', 0)
+            next_url = _nextSearchUrl(first_batch)
+
+            if next_url and batch_len > 0 and total_size > batch_len:
+                # Fan out the remaining offsets in parallel; batches are
+                # cataloged in order while later offsets are still in flight
+                starts = range(batch_len, total_size, batch_len)
+                logger.info(f"Fetching {len(starts)} more result pages in parallel ({total_size} total)")
+                complete = True
+                with ThreadPoolExecutor(max_workers=SEARCH_WORKERS) as executor:
+                    for batch in executor.map(
+                        lambda start: _fetchSearchBatch(search_url, login, password,
+                                                        params={**_SEARCH_PARAMS, 'start': start},
+                                                        expected_start=start),
+                        starts
+                    ):
+                        if batch is None:
+                            complete = False
+                            continue
+                        batch_count += 1
+                        _catalogSearchBatch(batch, catalog, batch_count)
+
+                # Overlapping batches are dropped silently by the catalog, so
+                # only a full count proves that no page was missed
+                complete = complete and len(catalog) >= total_size
+
+                if not complete:
+                    # Offsets failed or fell short - walk _links.next sequentially
+                    # instead, requesting each next page before cataloging the
+                    # current one (the catalog skips titles it already has)
+                    logger.warning("Offset pagination failed, following _links.next sequentially")
+                    with ThreadPoolExecutor(max_workers=1) as prefetcher:
+                        pending = prefetcher.submit(_fetchSearchBatch, next_url, login, password)
+                        while pending is not None:
+                            batch = pending.result()
+                            if batch is None:
+                                break
+                            next_url = _nextSearchUrl(batch)
+                            if next_url:
+                                pending = prefetcher.submit(_fetchSearchBatch, next_url, login, password)
+                            else:
+                                pending = None
+                            batch_count += 1
+                            _catalogSearchBatch(batch, catalog, batch_count)
+                    complete = next_url is None
             else:
-                logging.info(f"All pages retrieved: {current_count} total")
-                current_url = None  # Exit loop
+                complete = True
+
+        # Pages in the order they were cataloged
+        foundPages = [{'id': entry['id'], 'title': entry['title']} for entry in catalog.values()]
+
+        if complete:
+            logger.info(f"All pages retrieved: {len(foundPages)} total")
+
+    except Exception as e:
+        logger.error(f"Error during pagination: {e}")
+        complete = False
 
-        except Exception as e:
-            logging.error(f"Error during pagination: {e}")
-            break
+    logger.info(f"Found {len(foundPages)} pages in space {_SPACE} " +
+                f"with search pattern: {_SEARCH_PATTERN}")
 
-    logging.info(f"Found {len(foundPages)} pages in space {CONFIG['confluence_space']} " +
-                f"with search pattern: {CONFIG['confluence_search_pattern']}")
+    if complete:
+        _page_catalog.clear()
+        _page_catalog.update(catalog)
+        _title_index.clear()
+        _title_index.update(_indexPageCatalog(catalog))
+        savePageCatalog(catalog)
 
     return foundPages
 
@@ -502,67 +1214,54 @@ def cleanupOrphanPages(expected_pages_set, login, password):
     Returns:
         dict with 'deleted_count' and 'orphans' list
     """
-    logging.info("Starting differential orphan cleanup...")
-    logging.info(f"Expected pages: {len(expected_pages_set)}")
+    _ensureAuth(login, password)
+    logger.info("Starting differential orphan cleanup...")
+    logger.info(f"Expected pages: {len(expected_pages_set)}")
 
     # Find all autogenerated pages using paginated search
     all_pages = searchPages(login, password)
-    logging.info(f"Found {len(all_pages)} autogenerated pages in Confluence")
+    logger.info(f"Found {len(all_pages)} autogenerated pages in Confluence")
 
     if not all_pages:
-        logging.info("No pages to clean up")
+        logger.info("No pages to clean up")
         return {'deleted_count': 0, 'orphans': []}
 
     # Identify orphans by comparing against expected pages
     orphan_ids = []
     orphan_details = []
 
-    # Need to fetch page titles to compare
-    # Unfortunately, searchPages() only returns IDs, not titles
-    # We need to query each page's title or use a different approach
+    logger.info("Identifying orphans...")
 
-    logging.info("Identifying orphans (this may take a moment)...")
+    # Search results carry titles, so this is an in-memory set difference;
+    # membership tests need a set (callers may pass any iterable)
+    if not isinstance(expected_pages_set, (set, frozenset)):
+        expected_pages_set = set(expected_pages_set)
+    suffix_length = len(_TITLE_SUFFIX)
 
-    # Import here to avoid circular dependency
-    import requests
-    from requests.auth import HTTPBasicAuth
-
-    for page_id in all_pages:
-        try:
-            # Fetch page details to get title
-            response = requests.get(
-                url=f'{CONFIG["confluence_url"]}content/{page_id}',
-                auth=HTTPBasicAuth(login, password),
-                verify=False,
-                timeout=10
-            )
-
-            if response.status_code == 200:
-                page_data = response.json()
-                full_title = page_data.get('title', '')
-
-                # Extract base title by removing search pattern
-                search_pattern = str(CONFIG["confluence_search_pattern"])
-                if search_pattern in full_title:
-                    base_title = full_title.replace(f"  {search_pattern}", "").strip()
-                else:
-                    base_title = full_title
-
-                # Check if this page should exist
-                if base_title not in expected_pages_set:
-                    orphan_ids.append(page_id)
-                    orphan_details.append({
-                        'id': page_id,
-                        'title': full_title,
-                        'base_title': base_title
-                    })
-                    logging.debug(f"Orphan identified: {base_title} (ID: {page_id})")
-                else:
-                    logging.debug(f"Valid page: {base_title}")
+    for page in all_pages:
+        page_id = page['id']
+        full_title = page['title']
 
-        except Exception as e:
-            logging.warning(f"Error checking page {page_id}: {e}")
-            continue
+        # Extract base title by removing search pattern
+        if full_title.endswith(_TITLE_SUFFIX):
+            base_title = full_title[:-suffix_length]
+        elif _SEARCH_PATTERN in full_title:
+            # Pattern not at the end (e.g. edited title): old normalization
+            base_title = full_title.replace(_TITLE_SUFFIX, "").strip()
+        else:
+            base_title = full_title
+
+        # Check if this page should exist
+        if base_title not in expected_pages_set:
+            orphan_ids.append(page_id)
+            orphan_details.append({
+                'id': page_id,
+                'title': full_title,
+                'base_title': base_title
+            })
+            logger.debug("Orphan identified: %s (ID: %s)", base_title, page_id)
+        else:
+            logger.debug("Valid page: %s", base_title)
 
     # Safety check: prevent accidental mass deletion
     orphan_count = len(orphan_ids)
@@ -570,15 +1269,15 @@ def cleanupOrphanPages(expected_pages_set, login, password):
 
     if orphan_count > 0:
         orphan_percentage = (orphan_count / total_pages) * 100
-        logging.info(f"Identified {orphan_count} orphan pages ({orphan_percentage:.1f}% of total)")
+        logger.info(f"Identified {orphan_count} orphan pages ({orphan_percentage:.1f}% of total)")
 
         # Safety threshold: if >20% would be deleted, require confirmation
         if orphan_percentage > 20:
-            logging.warning(f"⚠️  Safety threshold exceeded: {orphan_percentage:.1f}% would be deleted")
-            logging.warning(f"   Expected: {len(expected_pages_set)} pages")
-            logging.warning(f"   Found: {total_pages} pages")
-            logging.warning(f"   Orphans: {orphan_count} pages")
-            logging.warning(f"   Skipping cleanup for safety. Review expected pages set.")
+            logger.warning(f"⚠️  Safety threshold exceeded: {orphan_percentage:.1f}% would be deleted")
+            logger.warning(f"   Expected: {len(expected_pages_set)} pages")
+            logger.warning(f"   Found: {total_pages} pages")
+            logger.warning(f"   Orphans: {orphan_count} pages")
+            logger.warning(f"   Skipping cleanup for safety. Review expected pages set.")
             return {
                 'deleted_count': 0,
                 'orphans': orphan_details,
@@ -587,39 +1286,83 @@ def cleanupOrphanPages(expected_pages_set, login, password):
             }
 
         # Delete orphans
-        logging.info(f"Deleting {orphan_count} orphan pages...")
+        logger.info(f"Deleting {orphan_count} orphan pages...")
         deleted = deletePages(orphan_ids, login, password)
 
-        logging.info(f"✅ Cleanup complete: {orphan_count} orphan pages deleted")
+        # Deleted pages need no published-content record; it was saved by
+        # publishFolder() already, so save it again without them
+        if deleted:
+            for page_id in deleted:
+                _published_hashes.pop(page_id, None)
+            savePublishedHashes()
+
+        logger.info(f"✅ Cleanup complete: {len(deleted)}/{orphan_count} orphan pages deleted")
         return {
-            'deleted_count': orphan_count,
+            'deleted_count': len(deleted),
             'orphans': orphan_details,
             'skipped': False
         }
     else:
-        logging.info("✅ No orphan pages found - all pages match local files")
+        logger.info("✅ No orphan pages found - all pages match local files")
         return {'deleted_count': 0, 'orphans': [], 'skipped': False}
 
 
 #
 # Function for deleting pages
 #
+def deletePage(page, login, password):
+    """
+    Delete a single page. Returns the DELETE status code, or None on exception.
+    """
+    _ensureAuth(login, password)
+    logger.debug("Delete page: %s%s", _CONTENT_URL, page)
+    try:
+        response = SESSION.delete(
+            url=_CONTENT_URL + str(page),
+            timeout=(CONNECT_TIMEOUT, 15))
+    except Exception as e:
+        logger.error(f"Error deleting page {page}: {e}")
+        return None
+    # Deletes run concurrently, so every line names its page
+    if response.status_code == 204:
+        logger.info("Deleted page %s", page)
+    else:
+        logger.warning("Delete of page %s returned status %s", page, response.status_code)
+    return response.status_code
+
+
 def deletePages(pagesIDList, login, password):
+    """
+    Delete pages concurrently.
 
+    Each DELETE is independent, so they are issued from a bounded thread pool
+    instead of one after another (wall time ~N/workers RTTs instead of N).
+    The pool shares SESSION's connection pool, so sockets are reused. Each
+    worker mostly waits on its socket, so threads up to the pool size scale
+    as well as coroutines would for this one host.
+
+    Returns the list of page IDs that were deleted (HTTP 204).
+    """
+    _ensureAuth(login, password)
 
     deletedPages = []
 
+    if not pagesIDList:
+        return deletedPages
 
-    for page in pagesIDList:
-        logging.info("Delete page: " + str(page))
-        logging.debug("Calling URL: " + str(CONFIG["confluence_url"]) + "content/" + str(page))
-        response = requests.delete(
-            url=str(CONFIG["confluence_url"]) + "content/" + str(page),
-            auth=HTTPBasicAuth(login, password),
-            verify=False)
-        logging.debug("Delete status code: " + str(response.status_code))
-        if response.status_code == 204:
-            logging.info("Deleted successfully")
+    with ThreadPoolExecutor(max_workers=min(DELETE_WORKERS, len(pagesIDList))) as executor:
+        status_codes = list(executor.map(lambda page: deletePage(page, login, password), pagesIDList))
+
+    failed = []
+    for page, status_code in zip(pagesIDList, status_codes):
+        if status_code == 204:
+            deletedPages.append(page)
+        else:
+            failed.append(page)
+
+    logger.info(f"Delete finished: {len(deletedPages)} deleted, {len(failed)} failed")
+    if failed:
+        logger.warning(f"Pages not deleted: {failed}")
 
     return deletedPages
 
@@ -627,30 +1370,46 @@ def deletePages(pagesIDList, login, password):
 # Function for attaching file
 # 
 def attachFile(pageIdForFileAttaching, attachedFile, login, password):
+    _ensureAuth(login, password)
  
     # make call to attache fale to a page
-    logging.debug("Calling URL: " + str(CONFIG["confluence_url"]) + "content/" + str(pageIdForFileAttaching) + "/child/attachment")
+    logger.debug("Calling URL: %s%s/child/attachment", _CONTENT_URL, pageIdForFileAttaching)
 
-    attachedFileStructure = {'file': attachedFile}
     attachedValues = {'comment': 'file was attached by the script'}
-    attachedHeader=  {"Accept": "application/json",
-                        "X-Atlassian-Token": "nocheck"} # disable token check. Otherwise it will be 443 status code
-
-    response = requests.post(
-        url=CONFIG["confluence_url"] + "content/" + str(pageIdForFileAttaching) + "/child/attachment",
-        files=attachedFileStructure,
-        data=attachedValues,
-        auth=HTTPBasicAuth(login, password),
-        headers=attachedHeader,
-        verify=False)
-
-    logging.debug(response.status_code)
+    # merged with the SESSION headers (Accept: application/json)
+    attachedHeader=  {"X-Atlassian-Token": "nocheck"} # disable token check. Otherwise it will be 443 status code
+    attachUrl = _CONTENT_URL + str(pageIdForFileAttaching) + "/child/attachment"
+
+    if MultipartEncoder is not None:
+        # stream the file into the request body chunk by chunk
+        encoder = MultipartEncoder(fields={
+            'file': (os.path.basename(attachedFile.name), attachedFile),
+            **attachedValues
+        })
+        attachedHeader['Content-Type'] = encoder.content_type
+        response = SESSION.post(
+            url=attachUrl,
+            data=encoder,
+            headers=attachedHeader,
+            timeout=(CONNECT_TIMEOUT, ATTACH_TIMEOUT))
+    else:
+        response = SESSION.post(
+            url=attachUrl,
+            files={'file': attachedFile},
+            data=attachedValues,
+            headers=attachedHeader,
+            timeout=(CONNECT_TIMEOUT, ATTACH_TIMEOUT))
+
+    logger.debug(response.status_code)
     if response.status_code == 200:
-        logging.info("File was attached successfully")
-        logging.debug(json.dumps(json.loads(response.text), indent=4, sort_keys=True))
+        logger.info("File was attached successfully")
+        response_json = _loads(response.content)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(_dumps(response_json, pretty=True))
 
         # return id of the attached file
-        logging.debug("Returning attached file id: " + json.loads(response.text)['results'][0]['id'])
-        return json.loads(response.text)['results'][0]['id']
+        attachment_id = response_json['results'][0]['id']
+        logger.debug("Returning attached file id: %s", attachment_id)
+        return attachment_id
     else:
-        logging.error("File has not attached")
+        logger.error("File has not attached")
@@ -1,17 +1,154 @@
+import hashlib
 import logging
 import os
 import markdown
+import multiprocessing
 import re
 import threading
 import time
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, FIRST_COMPLETED, wait
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache
+from html import escape
 from config.getconfig import getConfig
 from pagesController import createPage
 from pagesController import attachFile
+from pagesController import savePublishedHashes
+from pagesController import loadJsonState
+from pagesController import saveJsonState
 
 
 CONFIG = getConfig()
 
+# Pages published concurrently; optional "publish_workers" config key
+# (httpSession sizes its connection pool to match)
+PUBLISH_WORKERS = int(CONFIG.get("publish_workers") or 16)
+
+# Processes rendering markdown; markdown is pure Python and holds the GIL, so
+# threads cannot render in parallel. Optional "render_processes" config key,
+# 1 renders in the publishing threads
+RENDER_PROCESSES = int(CONFIG.get("render_processes") or os.cpu_count() or 1)
+
+# Attachment uploads of one page run in parallel, on top of PUBLISH_WORKERS
+ATTACH_WORKERS = 4
+
+# Folder of the image files referenced by markdown, joined to file names
+_IMAGE_FOLDER_PREFIX = str(CONFIG["github_folder_with_image_files"]) + "/"
+
+# Whole markdown line (with its newline) starting with a local (non-http)
+# image; group 1 is the path. The alt text may contain ']' (greedy up to the
+# last '](' on the line)
+_IMAGE_LINE_RE = re.compile(r'^!\[[^\n]*\]\((?!http)([^)\n]+)\)[^\n]*\n?', re.MULTILINE)
+
+# Storage format markup replacing an image line; called with the file name
+_IMAGE_MARKUP = '<ac:image><ri:attachment ri:filename="{}"/></ac:image>'.format
+
+# Extensions every markdown file is rendered with
+_MARKDOWN_EXTENSIONS = ['markdown.extensions.tables', 'fenced_code']
+
+# Rendered HTML of the previous run, keyed by a hash of the markdown source
+RENDER_CACHE_FILE = ".publisher_render_cache.json"
+
+# Body of every directory page: a children macro listing its subpages
+_DIRECTORY_PAGE_CONTENT = "<ac:structured-macro ac:name=\"children\" ac:schema-version=\"2\" ac:macro-id=\"80b8c33e-cc87-4987-8f88-dd36ee991b15\"/>"
+
+
+#
+# Functions to load and save the markdown render cache
+#
+def _renderCacheKey():
+    return f'{markdown.__version__}|{",".join(_MARKDOWN_EXTENSIONS)}'
+
+
+def loadRenderCache():
+    """
+    Load the rendered HTML saved by the previous run.
+
+    Returns {source hash: html}, or an empty dict if there is no cache or it
+    was written by another markdown version or extension set.
+    """
+    return loadJsonState(RENDER_CACHE_FILE, _renderCacheKey())
+
+
+def saveRenderCache(pages):
+    """
+    Persist the render cache atomically (write to temp file, then rename).
+    """
+    saveJsonState(RENDER_CACHE_FILE, _renderCacheKey(), pages)
+
+
+_render_cache = loadRenderCache()
+# Source hashes rendered or reused in this run (only these are saved again)
+_rendered_keys = set()
+
+
+# Process pool rendering cache misses while publishFolder() runs (None = inline)
+_render_pool = None
+
+
+#
+# Functions to start and stop the markdown render processes
+#
+def startRenderPool():
+    """
+    Start RENDER_PROCESSES render processes.
+
+    The processes are forked right away, before any publishing thread exists:
+    forking a process that runs threads can deadlock the child. Without the
+    "fork" start method (main.py has no __main__ guard to be re-imported by
+    spawn) markdown is rendered in the publishing threads instead.
+    """
+    global _render_pool
+    if RENDER_PROCESSES <= 1 or "fork" not in multiprocessing.get_all_start_methods():
+        return
+    _render_pool = ProcessPoolExecutor(
+        max_workers=RENDER_PROCESSES,
+        mp_context=multiprocessing.get_context("fork")
+    )
+    # The first submit launches all workers of a fork pool
+    _render_pool.submit(len, "").result()
+    logging.info(f"Started {RENDER_PROCESSES} markdown render processes")
+
+
+def stopRenderPool():
+    global _render_pool
+    if _render_pool is not None:
+        _render_pool.shutdown(wait=True)
+        _render_pool = None
+
+
+# Markdown converter of the current thread (or render process); a converter
+# is not thread-safe, but is reused by its thread via reset()
+_markdown_local = threading.local()
+
+
+def _renderHtml(text):
+    converter = getattr(_markdown_local, 'converter', None)
+    if converter is None:
+        converter = _markdown_local.converter = markdown.Markdown(extensions=_MARKDOWN_EXTENSIONS)
+    else:
+        converter.reset()
+    return converter.convert(text)
+
+
+def renderMarkdown(text):
+    """
+    Render markdown to HTML, reusing the previous run's output for unchanged sources.
+    Cache misses are rendered in the render processes when they are running.
+    """
+    key = hashlib.blake2b(text.encode('utf-8'), digest_size=16).hexdigest()
+    html = _render_cache.get(key)
+    if html is None:
+        pool = _render_pool
+        try:
+            html = pool.submit(_renderHtml, text).result() if pool else _renderHtml(text)
+        except BrokenProcessPool:
+            # A render process died - keep publishing, render in this thread
+            html = _renderHtml(text)
+        _render_cache[key] = html
+    _rendered_keys.add(key)
+    return html
+
 
 class PublishStats:
     """Thread-safe statistics tracking for parallel publishing with progress logging."""
@@ -22,6 +159,7 @@ class PublishStats:
         self.success_count = 0
         self.created_count = 0
         self.updated_count = 0
+        self.unchanged_count = 0
         self.total_pages = 0
         self.start_time = None
         self.last_progress_log = 0
@@ -40,21 +178,29 @@ class PublishStats:
                 self.created_count += 1
             elif operation == 'updated':
                 self.updated_count += 1
-            self._log_progress_if_needed()
+            elif operation == 'unchanged':
+                self.unchanged_count += 1
+            progress_due = self._progress_due()
+        # Log outside the lock, so other workers don't wait on log output
+        if progress_due:
+            self._log_progress()
 
     def add_error(self, error_info):
         with self.lock:
             self.errors.append(error_info)
-            self._log_progress_if_needed()
+            progress_due = self._progress_due()
+        if progress_due:
+            self._log_progress()
 
-    def _log_progress_if_needed(self):
-        """Log progress every 50 pages or 30 seconds."""
+    def _progress_due(self):
+        """Whether progress should be logged now (every 50 pages); call with the lock held."""
         completed = self.success_count + len(self.errors)
 
         # Log every 50 pages
         if completed > 0 and completed % 50 == 0 and completed != self.last_progress_log:
             self.last_progress_log = completed
-            self._log_progress()
+            return True
+        return False
 
     def _log_progress(self):
         """Log current progress metrics."""
@@ -97,7 +243,7 @@ class PublishStats:
             logging.info("📊 FINAL PUBLISHING SUMMARY")
             logging.info("=" * 80)
             logging.info(f"Total pages processed: {completed}/{self.total_pages}")
-            logging.info(f"✅ Successful: {self.success_count} ({self.created_count} created, {self.updated_count} updated)")
+            logging.info(f"✅ Successful: {self.success_count} ({self.created_count} created, {self.updated_count} updated, {self.unchanged_count} unchanged)")
             logging.info(f"❌ Errors: {len(self.errors)}")
 
             if self.total_pages > 0:
@@ -122,6 +268,60 @@ created_count = 0
 updated_count = 0
 
 
+#
+# Function walking the markdown folder tree
+#
+def _walkTree(folder):
+    """
+    Walk the folder top-down like os.walk(folder, followlinks=False).
+
+    Yields (root, title, dirs, files) per directory, title being its relative
+    path with '/' separators (None for folder itself); files holds only
+    entries that are files, following symlinks. Entries are classified and
+    symlinked directories are skipped using the type os.scandir() got from
+    the directory listing; os.walk() instead lstat()s every subdirectory
+    before descending into it. Unreadable directories are skipped.
+    """
+    stack = [(folder, None)]
+    while stack:
+        root, title = stack.pop()
+        dirs = []
+        files = []
+        subdirs = []
+        try:
+            with os.scandir(root) as entries:
+                for entry in entries:
+                    try:
+                        is_dir = entry.is_dir()
+                    except OSError:
+                        is_dir = False
+                    if not is_dir:
+                        # Only files that can be read: no dangling symlinks,
+                        # sockets or FIFOs (regular files need no extra stat)
+                        try:
+                            is_file = entry.is_file()
+                        except OSError:
+                            is_file = False
+                        if is_file:
+                            files.append(entry.name)
+                        else:
+                            logging.debug(f"Skipping non-file entry: {entry.path}")
+                        continue
+                    dirs.append(entry.name)
+                    # Symlinked directories are listed, but not walked into
+                    if not entry.is_symlink():
+                        subdirs.append(entry)
+        except OSError:
+            continue
+
+        yield root, title, dirs, files
+
+        prefix = '' if title is None else title + '/'
+        # Reversed, so subdirectories are walked in listing order
+        for entry in reversed(subdirs):
+            stack.append((entry.path, prefix + entry.name))
+
+
 def buildExpectedPagesSet(folder):
     """
     Build set of expected page titles from local markdown files and directories.
@@ -129,236 +329,302 @@ def buildExpectedPagesSet(folder):
     Walks the entire directory tree and collects relative paths (from base folder)
     for both directories and .md files. This ensures unique titles in Confluence.
 
-    Returns: Set of page titles using relative paths (without search pattern suffix)
+    The walk is also recorded as an ordered manifest so publishFolder() can
+    publish from it without walking the tree a second time.
+
+    Returns: (manifest, expected_pages)
+        manifest: List of (path, title, parent_title, is_dir) tuples in walk
+                  order (parents before children); parent_title is None for
+                  top-level entries
+        expected_pages: Set of page titles using relative paths (without search
+                        pattern suffix)
     """
+    manifest = []
     expected_pages = set()
-    base_folder = os.path.abspath(folder)
 
     logging.info(f"Building expected pages set from: {folder}")
 
-    for root, dirs, files in os.walk(folder):
-        # Calculate relative path from base folder for this directory
-        rel_root = os.path.relpath(root, base_folder)
+    # A directory is yielded before its subdirectories, which is the
+    # parents-first manifest order publishFolder() relies on
+    for root, parent_title, dirs, files in _walkTree(folder):
+        # Prefix of the relative paths of this directory's entries
+        rel_prefix = '' if parent_title is None else parent_title + '/'
 
         # Add directory names with relative paths
         for dir_name in dirs:
-            if rel_root == '.':
-                # Top-level directory
-                rel_path = dir_name
-            else:
-                # Nested directory
-                rel_path = os.path.join(rel_root, dir_name)
-            # Normalize path separators to forward slashes for consistency
-            rel_path = rel_path.replace(os.sep, '/')
+            rel_path = rel_prefix + dir_name
             expected_pages.add(rel_path)
+            manifest.append((os.path.join(root, dir_name), rel_path, parent_title, True))
             logging.debug(f"Expected directory page: {rel_path}")
 
-        # Add .md filenames with relative paths
+        # Add .md filenames with relative paths (suffix in any case; only the
+        # last three characters are lowered, not the whole name)
         for filename in files:
-            if filename.lower().endswith('.md'):
-                if rel_root == '.':
-                    # Top-level file
-                    rel_path = filename
-                else:
-                    # Nested file
-                    rel_path = os.path.join(rel_root, filename)
-                # Normalize path separators to forward slashes for consistency
-                rel_path = rel_path.replace(os.sep, '/')
+            if filename[-3:].lower() == '.md':
+                rel_path = rel_prefix + filename
                 expected_pages.add(rel_path)
+                manifest.append((os.path.join(root, filename), rel_path, parent_title, False))
                 logging.debug(f"Expected file page: {rel_path}")
 
     logging.info(f"Built expected pages set: {len(expected_pages)} pages")
-    return expected_pages
+    return manifest, expected_pages
+
+
+@lru_cache(maxsize=4096)
+def _isFileCached(path):
+    """
+    os.path.isfile() memoized per path; shared images are referenced from many
+    files. publishFolder() clears it at the start of every run.
+    """
+    return os.path.isfile(path)
 
 
-def processMarkdownFile(file_entry, parentPageID, login, password, base_folder):
+#
+# Function for uploading one image as a page attachment
+#
+def attachImage(imagePath, pageID, login, password):
+    """
+    Upload one image file as an attachment of the page. The file is opened in
+    the worker, so it is only held open while it uploads.
+    """
+    logging.info("Attaching file: " + imagePath + "  to the page: " + str(pageID))
+    with open(imagePath, 'rb') as attachedFile:
+        return attachFile(
+            pageIdForFileAttaching=pageID,
+            attachedFile=attachedFile,
+            login=login,
+            password=password
+        )
+
+
+def processMarkdownFile(file_path, title, parentPageID, login, password):
     """
     Process a single markdown file and create Confluence page.
 
     This function is extracted to enable parallel file processing.
-    Thread-safe: No shared state between files.
+    Thread-safe: the state shared between files is _stats (guarded by its
+    lock), the render cache and the published-hash record (single dict/set
+    operations per source hash or page ID, atomic under the GIL). Every page
+    is counted in _stats exactly once, as a success or as an error.
     """
-    rel_path = os.path.relpath(file_entry.path, base_folder)
-    rel_path = rel_path.replace(os.sep, '/')
-
-    logging.info("Processing file: " + str(file_entry.path))
+    logging.info("Processing file: " + str(file_path))
 
-    newFileContent = ""
     filesToUpload = []
 
-    with open(file_entry.path, 'r', encoding="utf-8") as mdFile:
-        for line in mdFile:
-            # search for images in each line and ignore http/https image links
-            # Pattern: \A!\[.*]\(.*\)\Z
-            # example:  ![test](/data_images/test_image.jpg)
-            result = re.findall("\A!\[.*]\((?!http)(.*)\)", line)
-
-            if bool(result):   # line contains an image
-                # extract filename from the full path
-                result = str(result).split('\'')[1]  # ['/data_images/test_image.jpg'] => /data_images/test_image.jpg
-                result = str(result).split('/')[-1]  # /data_images/test_image.jpg => test_image.jpg
-                logging.debug("Found file for attaching: " + result)
-                filesToUpload.append(result)
-                # replace line with conflunce storage format <ac:image> <ri:attachment ri:filename="test_image.jpg" /></ac:image>
-                newFileContent += "<ac:image> <ri:attachment ri:filename=\"" + result + "\" /></ac:image>"
-            else:  # line without an image
-                newFileContent += line
+    def replaceImage(match):
+        # extract filename from the full path
+        result = match.group(1).rsplit('/', 1)[-1]  # /data_images/test_image.jpg => test_image.jpg
+        logging.debug("Found file for attaching: " + result)
+        filesToUpload.append(result)
+        # replace line with conflunce storage format <ac:image><ri:attachment ri:filename="test_image.jpg"/></ac:image>
+        # (quotes, & or < in a file name must not break the storage format XML)
+        return _IMAGE_MARKUP(escape(result))
+
+    # Read in the worker thread: the read releases the GIL, so the reads of up
+    # to PUBLISH_WORKERS files overlap each other and the HTTP calls
+    with open(file_path, 'r', encoding="utf-8") as mdFile:
+        newFileContent = mdFile.read()
+
+    # Most files have no images: a substring scan rules that out faster
+    # than the regex can
+    if '![' in newFileContent:
+        # rewrite every image line in one pass over the whole file and
+        # ignore http/https image links
+        # example:  ![test](/data_images/test_image.jpg)
+        newFileContent = _IMAGE_LINE_RE.sub(replaceImage, newFileContent)
 
     # Create new page with unique title (relative path)
     result = createPage(
-        title=rel_path,
-        content=markdown.markdown(newFileContent, extensions=['markdown.extensions.tables', 'fenced_code']),
+        title=title,
+        content=renderMarkdown(newFileContent),
         parentPageID=parentPageID,
         login=login,
         password=password
     )
 
-    # Track result
+    # if do exist files to Upload as attachments
+    if result['success'] and bool(filesToUpload):
+        pageID = result['page_id']
+        imagePaths = []
+        for file in dict.fromkeys(filesToUpload):  # each image once, in order
+            imagePath = _IMAGE_FOLDER_PREFIX + file  # full path of uploaded image file
+            if _isFileCached(imagePath):  # check if the  file exist
+                imagePaths.append(imagePath)
+            else:
+                logging.error("File: " + str(imagePath) + "  not found. Nothing to attach")
+
+        if imagePaths:
+            try:
+                # Uploads to the same page are independent - run them in parallel
+                with ThreadPoolExecutor(max_workers=min(ATTACH_WORKERS, len(imagePaths))) as attachExecutor:
+                    list(attachExecutor.map(
+                        lambda imagePath: attachImage(imagePath, pageID, login, password),
+                        imagePaths
+                    ))
+            except Exception as e:
+                # The page was written but misses an image: this is its result
+                logging.error(f"Attaching images to page {pageID} failed: {e}")
+                result = {
+                    'success': False,
+                    'page_id': pageID,
+                    'error': f'Attachment upload failed: {e}',
+                    'status_code': 'attachment_failed'
+                }
+
+    # Track result (only now, so a page is never counted twice)
     if result['success']:
         _stats.add_success(operation=result.get('operation'))
-        pageID = result['page_id']
-
-        # if do exist files to Upload as attachments
-        if bool(filesToUpload):
-            for file in filesToUpload:
-                imagePath = str(CONFIG["github_folder_with_image_files"]) + "/" + file  # full path of uploaded image file
-                if os.path.isfile(imagePath):  # check if the  file exist
-                    logging.info("Attaching file: " + imagePath + "  to the page: " + str(pageID))
-                    with open(imagePath, 'rb') as attachedFile:
-                        attachFile(
-                            pageIdForFileAttaching=pageID,
-                            attachedFile=attachedFile,
-                            login=login,
-                            password=password
-                        )
-                else:
-                    logging.error("File: " + str(imagePath) + "  not found. Nothing to attach")
     else:
         # Log error and continue processing
         error_info = {
-            'path': str(file_entry.path),
+            'path': str(file_path),
             'type': 'file',
             'error': result.get('error', 'Unknown error'),
             'status_code': result.get('status_code', 'N/A')
         }
         _stats.add_error(error_info)
-        logging.warning(f"Skipping file {file_entry.path} due to error")
+        logging.warning(f"Skipping file {file_path} due to error")
 
     return result
 
 
-def publishFolder(folder, login, password, parentPageID=None, base_folder=None, executor=None):
+def publishDirectory(dir_path, title, parentPageID, login, password):
     """
-    Recursively publish folders and files to Confluence.
+    Create the Confluence page for a single directory.
+
+    Returns the page ID (parent for the directory's children), or None on error.
+    """
+    # Create directory page
+    logging.info(f"Creating directory page: {title}")
+    result = createPage(
+        title=title,
+        content=_DIRECTORY_PAGE_CONTENT,
+        parentPageID=parentPageID,
+        login=login,
+        password=password
+    )
 
-    Directories are processed SEQUENTIALLY (to avoid thread pool deadlock).
-    Files within each directory are processed in PARALLEL for speedup.
+    if result['success']:
+        _stats.add_success(operation=result.get('operation'))
+        return result['page_id']
+
+    _stats.add_error({
+        'path': str(dir_path),
+        'type': 'directory',
+        'error': result.get('error', 'Unknown error'),
+        'status_code': result.get('status_code', 'N/A')
+    })
+    logging.warning(f"Skipping directory {dir_path} and its children due to error")
+    return None
+
+
+def publishFolder(folder, login, password, parentPageID=None, manifest=None):
+    """
+    Publish folders and files to Confluence as a pipeline.
+
+    A page only depends on its parent directory page, so the children of a
+    directory are submitted to the pool as soon as that directory page exists.
+    Lookups and writes of unrelated pages overlap freely; there is no barrier
+    between depths.
 
     Args:
-        folder: Current folder being processed
+        folder: Root folder to publish
         login: Confluence email
         password: Confluence API token
         parentPageID: Parent page ID in Confluence (None for root)
-        base_folder: Base folder for calculating relative paths (for unique titles)
-        executor: ThreadPoolExecutor for parallel file processing (created on first call)
+        manifest: Walk manifest from buildExpectedPagesSet(); the folder is
+                  walked again only if it is not given
+
+
+    Returns:
+        Set of expected page titles (as from buildExpectedPagesSet()), so a
+        caller that lets publishFolder() walk the folder needs no second
+        traversal for the orphan cleanup
     """
-    # Initialize base_folder on first call
-    if base_folder is None:
-        base_folder = os.path.abspath(folder)
-
-    # Create executor on first call (shared across all recursive calls)
-    is_root = executor is None
-    if is_root:
-        executor = ThreadPoolExecutor(max_workers=8)  # For parallel file processing
-        logging.info("Initialized parallel executor with 8 workers for file processing")
-
-        # Count total pages for progress tracking
-        total_dirs = 0
-        total_files = 0
-        for root, dirs, files in os.walk(folder):
-            total_dirs += len(dirs)
-            total_files += len([f for f in files if f.lower().endswith('.md')])
-        _stats.set_total(total_dirs + total_files)
+    if manifest is None:
+        manifest, expected_pages = buildExpectedPagesSet(folder)
+    else:
+        expected_pages = {entry[1] for entry in manifest}
 
-    try:
-        logging.info("Publishing folder: " + folder)
+    # Image files may have changed since a previous run in this process
+    _isFileCached.cache_clear()
 
-        # Collect entries
-        dirs = []
-        files = []
-        for entry in os.scandir(folder):
-            if entry.is_dir():
-                dirs.append(entry)
-            elif entry.is_file() and str(entry.path).lower().endswith('.md'):
-                files.append(entry)
-
-        # PHASE 1: Process all subdirectories SEQUENTIALLY (avoids deadlock)
-        # Each directory page must be created before its children can be processed
-        for dir_entry in dirs:
-            # Calculate unique title
-            rel_path = os.path.relpath(dir_entry.path, base_folder)
-            rel_path = rel_path.replace(os.sep, '/')
-
-            # Create directory page
-            logging.info(f"Creating directory page: {rel_path}")
-            result = createPage(
-                title=rel_path,
-                content="<ac:structured-macro ac:name=\"children\" ac:schema-version=\"2\" ac:macro-id=\"80b8c33e-cc87-4987-8f88-dd36ee991b15\"/>",
-                parentPageID=parentPageID,
-                login=login,
-                password=password
-            )
+    # Before the thread pool: render processes must be forked without threads
+    startRenderPool()
+
+    executor = ThreadPoolExecutor(max_workers=PUBLISH_WORKERS)
+    logging.info(f"Initialized parallel executor with {PUBLISH_WORKERS} workers for page processing")
+
+    # Total pages for progress tracking
+    _stats.set_total(len(manifest))
 
-            if result['success']:
-                _stats.add_success(operation=result.get('operation'))
-                currentPageID = result['page_id']
+    # Manifest entries grouped by parent directory title (None is the root)
+    children = {}
+    for entry in manifest:
+        children.setdefault(entry[2], []).append(entry)
 
-                # Recursively process subdirectory (SEQUENTIAL - no thread pool for directories)
-                publishFolder(
-                    folder=dir_entry.path,
+    # Future -> (path, title, is_dir) of every page still in flight
+    pending = {}
+
+    def submitChildren(parent_title, parent_id):
+        # Directories first: each one gates a whole subtree, files gate nothing
+        siblings = sorted(children.get(parent_title, ()), key=lambda entry: not entry[3])
+        for path, title, _, is_dir in siblings:
+            if is_dir:
+                future = executor.submit(
+                    publishDirectory,
+                    dir_path=path,
+                    title=title,
+                    parentPageID=parent_id,
                     login=login,
-                    password=password,
-                    parentPageID=currentPageID,
-                    base_folder=base_folder,
-                    executor=executor  # Pass executor for file processing
+                    password=password
                 )
             else:
-                _stats.add_error({
-                    'path': str(dir_entry.path),
-                    'type': 'directory',
-                    'error': result.get('error', 'Unknown error'),
-                    'status_code': result.get('status_code', 'N/A')
-                })
-                logging.warning(f"Skipping directory {dir_entry.path} and its children due to error")
-
-        # PHASE 2: Process all files in PARALLEL (main speedup)
-        if files:
-            logging.info(f"Processing {len(files)} files in parallel...")
-            file_futures = {}
-
-            for file_entry in files:
                 future = executor.submit(
                     processMarkdownFile,
-                    file_entry=file_entry,
-                    parentPageID=parentPageID,
+                    file_path=path,
+                    title=title,
+                    parentPageID=parent_id,
                     login=login,
-                    password=password,
-                    base_folder=base_folder
+                    password=password
                 )
-                file_futures[future] = file_entry.path
+            pending[future] = (path, title, is_dir)
+
+    try:
+        logging.info("Publishing folder: " + folder)
+        submitChildren(None, parentPageID)
 
-            # Wait for all file processing in this folder to complete
-            for future in as_completed(file_futures):
-                path = file_futures[future]
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                path, title, is_dir = pending.pop(future)
                 try:
-                    future.result()
-                    logging.debug(f"Completed file: {path}")
+                    result = future.result()
                 except Exception as e:
-                    logging.error(f"Error processing file {path}: {e}")
+                    logging.error(f"Error processing {'directory' if is_dir else 'file'} {path}: {e}")
+                    # Count it, so the orphan cleanup does not run after a crash
+                    _stats.add_error({
+                        'path': str(path),
+                        'type': 'directory' if is_dir else 'file',
+                        'error': str(e),
+                        'status_code': 'exception'
+                    })
+                    continue
+
+                if not is_dir:
+                    logging.debug(f"Completed file: {path}")
+                elif result is not None:
+                    # Directory page exists - its children can start now
+                    submitChildren(title, result)
+                # A failed directory page skips its children
 
     finally:
-        # Shutdown executor only at root level
-        if is_root:
-            executor.shutdown(wait=True)
-            logging.info("Parallel executor shutdown complete")
-            _stats.log_final_summary()
+        executor.shutdown(wait=True)
+        logging.info("Parallel executor shutdown complete")
+        stopRenderPool()
+        _stats.log_final_summary()
+        # Keep only the renders this run used, so the cache doesn't grow forever
+        saveRenderCache({key: _render_cache[key] for key in _rendered_keys})
+        savePublishedHashes()
+
+    return expected_pages
@@ -0,0 +1,87 @@
+import json
+import os
+import sys
+import unittest
+from unittest import mock
+
+# The publisher modules read ./publisher/config/config.yaml on import
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+os.chdir(REPO_ROOT)
+sys.path.insert(0, os.path.join(REPO_ROOT, 'publisher'))
+
+import pagesController  # noqa: E402
+
+
+class FakeResponse:
+    def __init__(self, status_code, payload=None):
+        self.status_code = status_code
+        self.content = json.dumps(payload or {}).encode('utf-8')
+
+
+class CreatePageStaleIndexTest(unittest.TestCase):
+
+    def setUp(self):
+        pagesController.clearPageCache()
+        self.addCleanup(pagesController.clearPageCache)
+        patches = [
+            mock.patch.object(pagesController, '_gzip_bodies', False),
+            mock.patch.dict(pagesController._published_hashes, clear=True),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def test_stale_page_index_entry_fails_one_put(self):
+        full_title = pagesController._fullTitle('Stale.md')
+        # As prefetchExistingPages() leaves it: the index shares the cache entry
+        stale_page = {'id': '42', 'version': 1, 'title': full_title, 'body_hash': None, 'cached': True}
+        pagesController._existing_page_cache[full_title] = stale_page
+        pagesController._prefetched_titles.add(full_title)
+        page_index = {full_title: stale_page}
+
+        live_version = 5
+        put_versions = []
+
+        def put(url, data, **kwargs):
+            version = json.loads(data)['version']['number']
+            put_versions.append(version)
+            if version != live_version + 1:
+                return FakeResponse(409, {'message': 'Version must be incremented on update'})
+            return FakeResponse(200, {'id': '42'})
+
+        search_result = {'size': 1, 'results': [{'content': {
+            'id': '42', 'title': full_title, 'version': {'number': live_version},
+            'body': {'storage': {'value': 'old'}}
+        }}]}
+
+        with mock.patch.object(pagesController.SESSION, 'put', side_effect=put), \
+                mock.patch.object(pagesController.SESSION, 'get',
+                                  return_value=FakeResponse(200, search_result)) as get:
+            result = pagesController.createPage('Stale.md', '<p>new</p>', None, 'login', 'password',
+                                                page_index=page_index)
+
+        self.assertTrue(result['success'])
+        self.assertEqual(put_versions, [2, live_version + 1])
+        self.assertEqual(get.call_count, 1)
+
+
+class CleanupPublishedHashesTest(unittest.TestCase):
+
+    def test_deleted_orphans_leave_the_published_hashes(self):
+        live = [{'id': str(i), 'title': pagesController._fullTitle(f'{i}.md')} for i in range(1, 5)]
+        orphan = {'id': '9', 'title': pagesController._fullTitle('Old.md')}
+
+        with mock.patch.dict(pagesController._published_hashes, {'1': [2, 'a'], '9': [4, 'b']}, clear=True), \
+                mock.patch.object(pagesController, 'searchPages', return_value=live + [orphan]), \
+                mock.patch.object(pagesController, 'deletePages', return_value=['9']), \
+                mock.patch.object(pagesController, 'savePublishedHashes') as save:
+            result = pagesController.cleanupOrphanPages({'1.md', '2.md', '3.md', '4.md'}, 'login', 'password')
+            published = dict(pagesController._published_hashes)
+
+        self.assertEqual(result['deleted_count'], 1)
+        self.assertEqual(published, {'1': [2, 'a']})
+        save.assert_called_once_with()
+
+
+if __name__ == '__main__':
+    unittest.main()
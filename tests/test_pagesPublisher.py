@@ -0,0 +1,51 @@
+import os
+import sys
+import unittest
+from unittest import mock
+
+from requests.exceptions import ReadTimeout
+
+# The publisher modules read ./publisher/config/config.yaml on import
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+os.chdir(REPO_ROOT)
+sys.path.insert(0, os.path.join(REPO_ROOT, 'publisher'))
+
+import pagesPublisher  # noqa: E402
+
+
+class PublishFolderStatsTest(unittest.TestCase):
+
+    def setUp(self):
+        patches = [
+            mock.patch.object(pagesPublisher, '_stats', pagesPublisher.PublishStats()),
+            mock.patch.object(pagesPublisher, 'RENDER_PROCESSES', 1),
+            mock.patch.object(pagesPublisher, 'saveRenderCache'),
+            mock.patch.object(pagesPublisher, 'savePublishedHashes'),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def test_failed_attachment_counts_page_once(self):
+        manifest, expected_pages = pagesPublisher.buildExpectedPagesSet('./data')
+
+        def createPage(title, content, parentPageID, login, password):
+            return {'success': True, 'page_id': title, 'operation': 'created'}
+
+        def attachFile(pageIdForFileAttaching, attachedFile, login, password):
+            if pageIdForFileAttaching == '01 Folder level 1/01 Example.md':
+                raise ReadTimeout('attachment upload timed out')
+            return 'att1'
+
+        with mock.patch.object(pagesPublisher, 'createPage', side_effect=createPage), \
+                mock.patch.object(pagesPublisher, 'attachFile', side_effect=attachFile):
+            pagesPublisher.publishFolder('./data', 'login', 'password', manifest=manifest)
+
+        stats = pagesPublisher._stats
+        self.assertEqual(stats.success_count + len(stats.errors), len(expected_pages))
+        self.assertEqual(len(stats.errors), 1)
+        self.assertEqual(stats.errors[0]['status_code'], 'attachment_failed')
+
+
+if __name__ == '__main__':
+    unittest.main()